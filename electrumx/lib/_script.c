@@ -0,0 +1,314 @@
+/*
+ * Copyright (c) 2022 The Lambda Blockchain Developers
+ *
+ * The MIT License (MIT)
+ *
+ * Permission is hereby granted, free of charge, to any person obtaining
+ * a copy of this software and associated documentation files (the
+ * "Software"), to deal in the Software without restriction, including
+ * without limitation the rights to use, copy, modify, merge, publish,
+ * distribute, sublicense, and/or sell copies of the Software, and to
+ * permit persons to whom the Software is furnished to do so, subject to
+ * the following conditions:
+ *
+ * The above copyright notice and this permission notice shall be
+ * included in all copies or substantial portions of the Software.
+ *
+ * THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+ * EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+ * MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+ * NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+ * LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+ * OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+ * WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+ */
+
+/*
+ * C versions of the script scanners in electrumx/lib/script.py.
+ *
+ * Each function mirrors its pure-Python counterpart exactly and raises
+ * ValueError on a truncated script; the Python wrappers turn that into
+ * ScriptError.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+#define OP_PUSHDATA1 76
+#define OP_PUSHDATA2 77
+#define OP_PUSHDATA4 78
+#define OP_CHECKSIG 0xac
+#define OP_CHECKMULTISIGVERIFY 0xaf
+#define OP_PUSHINPUTREF 0xd0
+#define OP_REQUIREINPUTREF 0xd1
+#define OP_DISALLOWPUSHINPUTREF 0xd2
+#define OP_DISALLOWPUSHINPUTREFSIBLING 0xd3
+#define OP_PUSHINPUTREFSINGLETON 0xd8
+
+#define REF_LEN 36
+
+static int
+is_ref_op(unsigned int op)
+{
+    return ((op >= OP_PUSHINPUTREF && op <= OP_DISALLOWPUSHINPUTREFSIBLING)
+            || op == OP_PUSHINPUTREFSINGLETON);
+}
+
+/*
+ * Decode the length of the data following the push or ref opcode `op`
+ * whose operand starts at p[*n], advancing *n past any length prefix.
+ * Returns -1 if the script is truncated.
+ */
+static int
+push_len(const uint8_t *p, Py_ssize_t len, unsigned int op, Py_ssize_t *n,
+         uint64_t *dlen)
+{
+    Py_ssize_t i = *n;
+
+    if (op < OP_PUSHDATA1) {
+        *dlen = op;
+    }
+    else if (op == OP_PUSHDATA1) {
+        if (i + 1 > len)
+            return -1;
+        *dlen = p[i];
+        i += 1;
+    }
+    else if (op == OP_PUSHDATA2) {
+        if (i + 2 > len)
+            return -1;
+        *dlen = (uint64_t)p[i] | ((uint64_t)p[i + 1] << 8);
+        i += 2;
+    }
+    else if (op == OP_PUSHDATA4) {
+        if (i + 4 > len)
+            return -1;
+        *dlen = ((uint64_t)p[i] | ((uint64_t)p[i + 1] << 8)
+                 | ((uint64_t)p[i + 2] << 16) | ((uint64_t)p[i + 3] << 24));
+        i += 4;
+    }
+    else {
+        *dlen = REF_LEN;
+    }
+
+    if (*dlen > (uint64_t)(len - i))
+        return -1;
+    *n = i;
+    return 0;
+}
+
+static PyObject *
+truncated(void)
+{
+    PyErr_SetString(PyExc_ValueError, "truncated script");
+    return NULL;
+}
+
+static int
+append_new(PyObject *list, PyObject *item)
+{
+    int result;
+
+    if (item == NULL)
+        return -1;
+    result = PyList_Append(list, item);
+    Py_DECREF(item);
+    return result;
+}
+
+static PyObject *
+get_ops(PyObject *self, PyObject *arg)
+{
+    Py_buffer view;
+    const uint8_t *p;
+    Py_ssize_t len, n = 0;
+    uint64_t dlen;
+    PyObject *ops;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0)
+        return NULL;
+    p = view.buf;
+    len = view.len;
+
+    ops = PyList_New(0);
+    if (ops == NULL)
+        goto error;
+
+    while (n < len) {
+        unsigned int op = p[n++];
+        PyObject *item;
+
+        if (op <= OP_PUSHDATA4 || is_ref_op(op)) {
+            if (push_len(p, len, op, &n, &dlen) < 0) {
+                truncated();
+                goto error;
+            }
+            item = Py_BuildValue("(iy#)", op, (const char *)p + n,
+                                 (Py_ssize_t)dlen);
+            n += (Py_ssize_t)dlen;
+        }
+        else {
+            item = PyLong_FromLong(op);
+        }
+        if (append_new(ops, item) < 0)
+            goto error;
+    }
+
+    PyBuffer_Release(&view);
+    return ops;
+
+error:
+    Py_XDECREF(ops);
+    PyBuffer_Release(&view);
+    return NULL;
+}
+
+static PyObject *
+get_push_input_refs(PyObject *self, PyObject *arg)
+{
+    Py_buffer view;
+    const uint8_t *p;
+    Py_ssize_t len, n = 0;
+    uint64_t dlen;
+    PyObject *all_refs = NULL, *normal_refs = NULL, *singleton_refs = NULL;
+    PyObject *result;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0)
+        return NULL;
+    p = view.buf;
+    len = view.len;
+
+    all_refs = PyList_New(0);
+    normal_refs = PyList_New(0);
+    singleton_refs = PyList_New(0);
+    if (all_refs == NULL || normal_refs == NULL || singleton_refs == NULL)
+        goto error;
+
+    while (n < len) {
+        unsigned int op = p[n++];
+
+        if (op <= OP_PUSHDATA4 || is_ref_op(op)) {
+            if (push_len(p, len, op, &n, &dlen) < 0) {
+                truncated();
+                goto error;
+            }
+            if (op == OP_PUSHINPUTREF || op == OP_PUSHINPUTREFSINGLETON) {
+                PyObject *ref = PyBytes_FromStringAndSize((const char *)p + n,
+                                                          REF_LEN);
+                if (ref == NULL)
+                    goto error;
+                if (PyList_Append(all_refs, ref) < 0
+                    || PyList_Append(op == OP_PUSHINPUTREF ? normal_refs
+                                     : singleton_refs, ref) < 0) {
+                    Py_DECREF(ref);
+                    goto error;
+                }
+                Py_DECREF(ref);
+            }
+            n += (Py_ssize_t)dlen;
+        }
+    }
+
+    PyBuffer_Release(&view);
+    result = PyTuple_Pack(3, all_refs, normal_refs, singleton_refs);
+    Py_DECREF(all_refs);
+    Py_DECREF(normal_refs);
+    Py_DECREF(singleton_refs);
+    return result;
+
+error:
+    Py_XDECREF(all_refs);
+    Py_XDECREF(normal_refs);
+    Py_XDECREF(singleton_refs);
+    PyBuffer_Release(&view);
+    return NULL;
+}
+
+static PyObject *
+zero_refs(PyObject *self, PyObject *arg)
+{
+    Py_buffer view;
+    const uint8_t *p;
+    uint8_t *out;
+    Py_ssize_t len, n = 0, m = 0;
+    uint64_t dlen;
+    int requires_sig = 0;
+    PyObject *result;
+
+    if (PyObject_GetBuffer(arg, &view, PyBUF_SIMPLE) < 0)
+        return NULL;
+    p = view.buf;
+    len = view.len;
+
+    /* The output is never longer than the input; it is only returned
+       if a check sig opcode is seen. */
+    result = PyBytes_FromStringAndSize(NULL, len);
+    if (result == NULL)
+        goto error;
+    out = (uint8_t *)PyBytes_AS_STRING(result);
+
+    while (n < len) {
+        unsigned int op = p[n++];
+
+        out[m++] = (uint8_t)op;
+
+        /* Refs are only zeroed when a check sig opcode is used */
+        if (op >= OP_CHECKSIG && op <= OP_CHECKMULTISIGVERIFY)
+            requires_sig = 1;
+
+        if (op <= OP_PUSHDATA4 || is_ref_op(op)) {
+            if (push_len(p, len, op, &n, &dlen) < 0) {
+                truncated();
+                goto error;
+            }
+            /* As in the Python version, pushdata length prefixes are
+               not copied to the output. */
+            if (op <= OP_PUSHDATA4)
+                memcpy(out + m, p + n, (size_t)dlen);
+            else
+                memset(out + m, 0, REF_LEN);
+            m += (Py_ssize_t)dlen;
+            n += (Py_ssize_t)dlen;
+        }
+    }
+
+    PyBuffer_Release(&view);
+    if (requires_sig) {
+        if (m != len && _PyBytes_Resize(&result, m) < 0)
+            return NULL;
+        return result;
+    }
+    Py_DECREF(result);
+    Py_INCREF(arg);
+    return arg;
+
+error:
+    Py_XDECREF(result);
+    PyBuffer_Release(&view);
+    return NULL;
+}
+
+static PyMethodDef script_methods[] = {
+    {"get_ops", get_ops, METH_O,
+     "Return the list of ops of a script."},
+    {"get_push_input_refs", get_push_input_refs, METH_O,
+     "Return the (all, normal, singleton) push input refs of a script."},
+    {"zero_refs", zero_refs, METH_O,
+     "Return the script with its refs zeroed if it checks a signature."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef script_module = {
+    PyModuleDef_HEAD_INIT,
+    "_script",
+    "C implementations of the script scanners.",
+    -1,
+    script_methods
+};
+
+PyMODINIT_FUNC
+PyInit__script(void)
+{
+    return PyModule_Create(&script_module);
+}
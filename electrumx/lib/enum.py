@@ -41,6 +41,9 @@ class Enumeration:
             lookup[x] = i
             reverseLookup[i] = x
             i = i + 1
+        # Members are plain attributes so reading them does not go
+        # through __getattr__
+        self.__dict__.update(lookup)
         self.lookup = lookup
         self.reverseLookup = reverseLookup
 
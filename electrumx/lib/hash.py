@@ -101,20 +101,23 @@ def ripemd160(x):
 
 def sha256(x):
     '''SHA-256 hash of the input.'''
-    # Create a new SHA-256 hash object
-    firsthash = hashlib.sha256()
-    # Update the hash object with the input data
-    firsthash.update(x)
-    # Return the digest (the hash value)
-    return firsthash.digest()
-
+    return _sha256(x).digest()
 
 
 def double_sha256(x):
     '''SHA-256 of SHA-256, as used extensively in Bitcoin and Bitcoin Cash.'''
-    first_hash = sha256(x)      # First SHA-256
-    second_hash = sha256(first_hash)  # Second SHA-256
-    return second_hash
+    # Inlined rather than calling sha256() twice; this is called for
+    # every transaction
+    return _sha256(_sha256(x).digest()).digest()
+
+
+def double_sha256_batch(items):
+    '''Return a list of the double SHA-256 of each item in items.
+
+    Hashing many small messages is dominated by per-call overhead, so
+    prefer this to repeated calls of double_sha256().
+    '''
+    return [_sha256(_sha256(item).digest()).digest() for item in items]
 
 def hash_to_hex_str(x):
     '''Convert a big-endian binary hash to displayed hex string.
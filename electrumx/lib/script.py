@@ -33,6 +33,12 @@ from electrumx.lib.enum import Enumeration
 from electrumx.lib.util import unpack_le_uint16_from, unpack_le_uint32_from, \
     pack_le_uint16, pack_le_uint32
 
+try:
+    from electrumx.lib import _script
+except ImportError:
+    _script = None
+
+
 class ScriptError(Exception):
     '''Exception used for script errors.'''
 
@@ -154,6 +160,74 @@ assert OpCodes.OP_STATESCRIPTBYTECODE_UTXO == 0xeb
 assert OpCodes.OP_STATESCRIPTBYTECODE_OUTPUT == 0xec
 assert OpCodes.OP_PUSH_TX_STATE == 0xed
 
+# Plain ints for the opcodes compared against in hot paths
+OP_PUSHDATA1 = OpCodes.OP_PUSHDATA1
+OP_CHECKSIG = OpCodes.OP_CHECKSIG
+OP_PUSHINPUTREF = OpCodes.OP_PUSHINPUTREF
+OP_PUSHINPUTREFSINGLETON = OpCodes.OP_PUSHINPUTREFSINGLETON
+
+# Opcodes that are followed by a 36-byte outpoint reference
+_REF_OPS = frozenset((
+    OpCodes.OP_PUSHINPUTREF,
+    OpCodes.OP_REQUIREINPUTREF,
+    OpCodes.OP_DISALLOWPUSHINPUTREF,
+    OpCodes.OP_DISALLOWPUSHINPUTREFSIBLING,
+    OpCodes.OP_PUSHINPUTREFSINGLETON,
+))
+
+# What zero_refs() replaces each ref with
+_ZERO_REF = bytes(36)
+
+# Sentinels in _FIXED_PUSH_LEN for pushes whose length is encoded in
+# the script.  They cannot clash with direct pushes, which are < 76.
+_LEN_PUSHDATA1 = 253
+_LEN_PUSHDATA2 = 254
+_LEN_PUSHDATA4 = 255
+
+
+def _fixed_push_len_table():
+    table = bytearray(256)
+    for op in range(1, OpCodes.OP_PUSHDATA1):
+        table[op] = op
+    table[OpCodes.OP_PUSHDATA1] = _LEN_PUSHDATA1
+    table[OpCodes.OP_PUSHDATA2] = _LEN_PUSHDATA2
+    table[OpCodes.OP_PUSHDATA4] = _LEN_PUSHDATA4
+    for op in _REF_OPS:
+        table[op] = 36
+    return bytes(table)
+
+
+# Number of bytes following each opcode, indexed by opcode
+_FIXED_PUSH_LEN = _fixed_push_len_table()
+
+
+def _opcode_bitmap(opcodes):
+    return sum(1 << op for op in opcodes)
+
+
+# Opcode classes as bitmaps, tested with (bitmap >> op) & 1
+_PUSH_OPS = _opcode_bitmap(range(OpCodes.OP_PUSHDATA4 + 1))
+_REF_OPS_BITMAP = _opcode_bitmap(_REF_OPS)
+_DATA_OPS = _PUSH_OPS | _REF_OPS_BITMAP
+_CHECKSIG_OPS = _opcode_bitmap((
+    OpCodes.OP_CHECKSIG,
+    OpCodes.OP_CHECKSIGVERIFY,
+    OpCodes.OP_CHECKMULTISIG,
+    OpCodes.OP_CHECKMULTISIGVERIFY,
+))
+
+# Opcode prefixes used when building scripts
+_PUSH_PREFIX = tuple(bytes((n,)) for n in range(OpCodes.OP_PUSHDATA1))
+_PUSHDATA2 = bytes((OpCodes.OP_PUSHDATA2,))
+_PUSHDATA4 = bytes((OpCodes.OP_PUSHDATA4,))
+_P2PKH_PREFIX = bytes((OpCodes.OP_DUP, OpCodes.OP_HASH160))
+_P2PKH_SUFFIX = bytes((OpCodes.OP_EQUALVERIFY, OpCodes.OP_CHECKSIG))
+_P2SH_PREFIX = bytes((OpCodes.OP_HASH160,))
+_P2SH_SUFFIX = bytes((OpCodes.OP_EQUAL,))
+_P2PKH_PREFIX_20 = _P2PKH_PREFIX + _PUSH_PREFIX[20]
+_P2SH_PREFIX_20 = _P2SH_PREFIX + _PUSH_PREFIX[20]
+
+
 def is_unspendable_legacy(script):
     # OP_FALSE OP_RETURN or OP_RETURN
     return script[:2] == b'\x00\x6a' or (script and script[0] == 0x6a)
@@ -164,6 +238,32 @@ def is_unspendable_genesis(script):
     return script[:2] == b'\x00\x6a'
 
 
+# The standard script checks below let the pure-Python scanners skip
+# the common scripts; only that fallback uses them, as the C scanner is
+# faster without them.
+
+def is_P2PKH(script):
+    '''Return True if script is a standard pay-to-pubkey-hash script.'''
+    # OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG
+    return (len(script) == 25 and script[:3] == _P2PKH_PREFIX_20
+            and script[23:] == _P2PKH_SUFFIX)
+
+
+def is_P2SH(script):
+    '''Return True if script is a standard pay-to-script-hash script.'''
+    # OP_HASH160 <20 bytes> OP_EQUAL
+    return (len(script) == 23 and script[:2] == _P2SH_PREFIX_20
+            and script[22:] == _P2SH_SUFFIX)
+
+
+def is_P2PK(script):
+    '''Return True if script is a standard pay-to-pubkey script.'''
+    # <33 or 65 byte pubkey> OP_CHECKSIG
+    n = len(script)
+    return ((n == 35 or n == 67) and script[0] == n - 2
+            and script[-1] == OP_CHECKSIG)
+
+
 def _match_ops(ops, pattern):
     if len(ops) != len(pattern):
         return False
@@ -189,22 +289,27 @@ class ScriptPubKey(object):
 
     @classmethod
     def P2SH_script(cls, hash160):
-        return (bytes([OpCodes.OP_HASH160])
-                + Script.push_data(hash160)
-                + bytes([OpCodes.OP_EQUAL]))
+        return _P2SH_PREFIX + Script.push_data(hash160) + _P2SH_SUFFIX
 
     @classmethod
     def P2PKH_script(cls, hash160):
-        return (bytes([OpCodes.OP_DUP, OpCodes.OP_HASH160])
-                + Script.push_data(hash160)
-                + bytes([OpCodes.OP_EQUALVERIFY, OpCodes.OP_CHECKSIG]))
+        return _P2PKH_PREFIX + Script.push_data(hash160) + _P2PKH_SUFFIX
 
 
 class Script(object):
 
     @classmethod
     def get_ops(cls, script):
+        if _script is not None:
+            try:
+                return _script.get_ops(script)
+            except ValueError:
+                raise ScriptError('truncated script') from None
+
         ops = []
+        # Locals for the loop
+        data_ops = _DATA_OPS
+        push_len = _FIXED_PUSH_LEN
 
         # The unpacks or script[n] below throw on truncated scripts
         try:
@@ -213,21 +318,18 @@ class Script(object):
                 op = script[n]
                 n += 1
 
-                if op <= OpCodes.OP_PUSHDATA4:
+                if (data_ops >> op) & 1:
                     # Raw bytes follow
-                    if op < OpCodes.OP_PUSHDATA1:
-                        dlen = op
-                    elif op == OpCodes.OP_PUSHDATA1:
+                    dlen = push_len[op]
+                    if dlen == _LEN_PUSHDATA1:
                         dlen = script[n]
                         n += 1
-                    elif op == OpCodes.OP_PUSHDATA2:
-                        dlen, = unpack_le_uint16_from(script[n: n + 2])
+                    elif dlen == _LEN_PUSHDATA2:
+                        dlen, = unpack_le_uint16_from(script, n)
                         n += 2
-                    elif op == OpCodes.OP_PUSHDATA4:
-                        dlen, = unpack_le_uint32_from(script[n: n + 4])
+                    elif dlen == _LEN_PUSHDATA4:
+                        dlen, = unpack_le_uint32_from(script, n)
                         n += 4
-                    elif op == OpCodes.OP_PUSHINPUTREF or op == OpCodes.OP_REQUIREINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREFSIBLING or op == OpCodes.OP_PUSHINPUTREFSINGLETON:
-                        dlen = 36 # Grab 36 bytes for the hash
                     if n + dlen > len(script):
                         raise IndexError
 
@@ -245,9 +347,24 @@ class Script(object):
     # Saves the push input refs of a script in the order they were encountered
     @classmethod
     def get_push_input_refs(cls, script):
+        if _script is not None:
+            try:
+                return _script.get_push_input_refs(script)
+            except ValueError:
+                raise ScriptError('get_push_input_refs script') from None
+
+        # Standard scripts push no refs
+        if is_P2PKH(script) or is_P2SH(script) or is_P2PK(script):
+            return ([], [], [])
+
         all_refs = []
         normal_refs = []
         singleton_refs = []
+        # Locals for the loop
+        data_ops = _DATA_OPS
+        push_len = _FIXED_PUSH_LEN
+        push_input_ref = OP_PUSHINPUTREF
+        push_input_ref_singleton = OP_PUSHINPUTREFSINGLETON
 
         # The unpacks or script[n] below throw on truncated scripts
         try:
@@ -256,39 +373,31 @@ class Script(object):
                 op = script[n]
                 n += 1
 
-                if op <= OpCodes.OP_PUSHDATA4:
-                    # Raw bytes follow
-                    if op < OpCodes.OP_PUSHDATA1:
-                        dlen = op
-                    elif op == OpCodes.OP_PUSHDATA1:
+                if (data_ops >> op) & 1:
+                    # Raw bytes or a 36-byte ref follow
+                    dlen = push_len[op]
+                    if dlen == _LEN_PUSHDATA1:
                         dlen = script[n]
                         n += 1
-                    elif op == OpCodes.OP_PUSHDATA2:
-                        dlen, = unpack_le_uint16_from(script[n: n + 2])
+                    elif dlen == _LEN_PUSHDATA2:
+                        dlen, = unpack_le_uint16_from(script, n)
                         n += 2
-                    elif op == OpCodes.OP_PUSHDATA4:
-                        dlen, = unpack_le_uint32_from(script[n: n + 4])
+                    elif dlen == _LEN_PUSHDATA4:
+                        dlen, = unpack_le_uint32_from(script, n)
                         n += 4
                     if n + dlen > len(script):
                         raise IndexError
-                
-                    n += dlen 
-                    
-                if op == OpCodes.OP_PUSHINPUTREF or op == OpCodes.OP_REQUIREINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREFSIBLING or op == OpCodes.OP_PUSHINPUTREFSINGLETON:
-                    dlen = 36 # Grab 36 bytes
-                
-                    if op == OpCodes.OP_PUSHINPUTREF or op == OpCodes.OP_PUSHINPUTREFSINGLETON:
+
+                    if op == push_input_ref:
                         ref = script[n:n + dlen]
                         all_refs.append(ref)
-                        if op == OpCodes.OP_PUSHINPUTREF:
-                            normal_refs.append(ref)
-                        elif op == OpCodes.OP_PUSHINPUTREFSINGLETON:
-                            singleton_refs.append(ref)
-
-                    if n + dlen > len(script):
-                        raise IndexError
+                        normal_refs.append(ref)
+                    elif op == push_input_ref_singleton:
+                        ref = script[n:n + dlen]
+                        all_refs.append(ref)
+                        singleton_refs.append(ref)
 
-                    n += dlen  
+                    n += dlen
 
         except Exception as e:
             raise ScriptError('get_push_input_refs script') from None
@@ -297,8 +406,24 @@ class Script(object):
 
     @classmethod
     def zero_refs(cls, script):
+        if _script is not None:
+            try:
+                return _script.zero_refs(script)
+            except ValueError:
+                raise ScriptError('truncated script') from None
+
+        # Standard scripts have no refs to zero and no pushdata prefixes
+        # to drop
+        if is_P2PKH(script) or is_P2SH(script) or is_P2PK(script):
+            return script
+
         ops = bytearray()
         requires_sig = False
+        # Locals for the loop
+        checksig_ops = _CHECKSIG_OPS
+        push_ops = _PUSH_OPS
+        ref_ops = _REF_OPS_BITMAP
+        push_len = _FIXED_PUSH_LEN
 
         # The unpacks or script[n] below throw on truncated scripts
         try:
@@ -309,21 +434,20 @@ class Script(object):
                 n += 1
 
                 # Refs are only zeroed when a check sig opcode is used
-                if op == OpCodes.OP_CHECKSIG or op == OpCodes.OP_CHECKSIGVERIFY or op == OpCodes.OP_CHECKMULTISIG or op == OpCodes.OP_CHECKMULTISIGVERIFY:
+                if (checksig_ops >> op) & 1:
                     requires_sig = True
 
-                if op <= OpCodes.OP_PUSHDATA4:
+                if (push_ops >> op) & 1:
                     # Raw bytes follow
-                    if op < OpCodes.OP_PUSHDATA1:
-                        dlen = op
-                    elif op == OpCodes.OP_PUSHDATA1:
+                    dlen = push_len[op]
+                    if dlen == _LEN_PUSHDATA1:
                         dlen = script[n]
                         n += 1
-                    elif op == OpCodes.OP_PUSHDATA2:
-                        dlen, = unpack_le_uint16_from(script[n: n + 2])
+                    elif dlen == _LEN_PUSHDATA2:
+                        dlen, = unpack_le_uint16_from(script, n)
                         n += 2
-                    elif op == OpCodes.OP_PUSHDATA4:
-                        dlen, = unpack_le_uint32_from(script[n: n + 4])
+                    elif dlen == _LEN_PUSHDATA4:
+                        dlen, = unpack_le_uint32_from(script, n)
                         n += 4
                     if n + dlen > len(script):
                         raise IndexError
@@ -331,13 +455,13 @@ class Script(object):
                     ops.extend(script[n:n + dlen])
                     n += dlen
 
-                if op == OpCodes.OP_PUSHINPUTREF or op == OpCodes.OP_REQUIREINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREF or op == OpCodes.OP_DISALLOWPUSHINPUTREFSIBLING or op == OpCodes.OP_PUSHINPUTREFSINGLETON:
+                elif (ref_ops >> op) & 1:
                     dlen = 36 # Grab 36 bytes
 
                     if n + dlen > len(script):
                         raise IndexError
 
-                    ops.extend(bytes(36))
+                    ops.extend(_ZERO_REF)
                     n += dlen
 
         except Exception:
@@ -355,13 +479,13 @@ class Script(object):
         assert isinstance(data, (bytes, bytearray))
 
         n = len(data)
-        if n < OpCodes.OP_PUSHDATA1:
-            return bytes([n]) + data
+        if n < OP_PUSHDATA1:
+            return _PUSH_PREFIX[n] + data
         if n < 256:
-            return bytes([OpCodes.OP_PUSHDATA1, n]) + data
+            return bytes((OP_PUSHDATA1, n)) + data
         if n < 65536:
-            return bytes([OpCodes.OP_PUSHDATA2]) + pack_le_uint16(n) + data
-        return bytes([OpCodes.OP_PUSHDATA4]) + pack_le_uint32(n) + data
+            return _PUSHDATA2 + pack_le_uint16(n) + data
+        return _PUSHDATA4 + pack_le_uint32(n) + data
 
     @classmethod
     def opcode_name(cls, opcode):
@@ -77,8 +77,11 @@
 '''Transaction-related classes and functions.'''
 
 from collections import namedtuple
+from struct import Struct
 
-from electrumx.lib.hash import double_sha256, hash_to_hex_str, sha256
+from electrumx.lib.hash import (
+    double_sha256, double_sha256_batch, hash_to_hex_str, sha256
+)
 from electrumx.lib.util import (
     unpack_le_int32_from, unpack_le_int64_from, unpack_le_uint16_from,
     unpack_be_uint16_from,
@@ -89,19 +92,36 @@ from electrumx.lib.script import Script
 ZERO = bytes(32)
 MINUS_1 = 4294967295
 
+# prev_hash and prev_idx of a serialized input
+pack_outpoint = Struct('<32sI').pack
+
+# version, input count, hashPrevInputs, hashSequence, output count,
+# hashOutputHashes and locktime of a version 3 txid preimage
+pack_v3_preimage = Struct('<Ii32s32si32sI').pack
+
+# Push ref count and hash of an output script with no push refs
+NO_PUSHREFS = pack_le_uint32(0) + ZERO
+
 
 class Tx(namedtuple("Tx", "version inputs outputs locktime")):
     '''Class representing a transaction.'''
 
     def serialize(self):
-        return b''.join((
-            pack_le_int32(self.version),
-            pack_varint(len(self.inputs)),
-            b''.join(tx_in.serialize() for tx_in in self.inputs),
-            pack_varint(len(self.outputs)),
-            b''.join(tx_out.serialize() for tx_out in self.outputs),
-            pack_le_uint32(self.locktime)
-        ))
+        # Inputs and outputs are written inline into a single buffer
+        buf = bytearray(pack_le_int32(self.version))
+        buf += pack_varint(len(self.inputs))
+        for tx_in in self.inputs:
+            buf += pack_outpoint(tx_in.prev_hash, tx_in.prev_idx)
+            buf += pack_varint(len(tx_in.script))
+            buf += tx_in.script
+            buf += pack_le_uint32(tx_in.sequence)
+        buf += pack_varint(len(self.outputs))
+        for tx_out in self.outputs:
+            buf += pack_le_int64(tx_out.value)
+            buf += pack_varint(len(tx_out.pk_script))
+            buf += tx_out.pk_script
+        buf += pack_le_uint32(self.locktime)
+        return bytes(buf)
 
 
 class TxInput(namedtuple("TxInput", "prev_hash prev_idx script sequence")):
@@ -117,21 +137,15 @@ class TxInput(namedtuple("TxInput", "prev_hash prev_idx script sequence")):
         return self.prev_idx == MINUS_1 and self.prev_hash == ZERO
 
     def serialize(self):
-        return b''.join((
-            self.prev_hash,
-            pack_le_uint32(self.prev_idx),
-            pack_varbytes(self.script),
-            pack_le_uint32(self.sequence),
-        ))
+        return (pack_outpoint(self.prev_hash, self.prev_idx)
+                + pack_varbytes(self.script)
+                + pack_le_uint32(self.sequence))
 
 
 class TxOutput(namedtuple("TxOutput", "value pk_script")):
 
     def serialize(self):
-        return b''.join((
-            pack_le_int64(self.value),
-            pack_varbytes(self.pk_script),
-        ))
+        return pack_le_int64(self.value) + pack_varbytes(self.pk_script)
 
 
 class Deserializer(object):
@@ -152,12 +166,13 @@ class Deserializer(object):
 
     def read_tx(self):
         '''Return a deserialized transaction.'''
-        return Tx(
-            self._read_le_int32(),  # version
-            self._read_inputs(),    # inputs
-            self._read_outputs(),   # outputs
-            self._read_le_uint32()  # locktime
-        )
+        version, = unpack_le_int32_from(self.binary, self.cursor)
+        self.cursor += 4
+        inputs = self._read_inputs()
+        outputs = self._read_outputs()
+        locktime, = unpack_le_uint32_from(self.binary, self.cursor)
+        self.cursor += 4
+        return Tx(version, inputs, outputs, locktime)
 
     def read_tx_and_hash(self):
         '''Return a (deserialized TX, tx_hash) pair.
@@ -176,103 +191,116 @@ class Deserializer(object):
     # Get the double_sha256 of the transaction preimage used for generating the new txid
     # The benefits of using version 3 is we can do compressed induction proofs
     def get_transaction_hash_preimage_v3(self, tx):
+        return double_sha256(self.get_preimage_v3(tx))
+
+    # Get the transaction preimage used for generating the version 3 txid
+    def get_preimage_v3(self, tx):
         hashPrevInputs = self.get_hash_prev_inputs(tx)
         hashSequence = self.get_hash_sequence(tx)
         hashOutputHashes = self.get_hash_output_hashes(tx)
-        preimage = b''.join((
-            pack_le_uint32(tx.version),
-            pack_le_int32(len(tx.inputs)),
+        return pack_v3_preimage(
+            tx.version,
+            len(tx.inputs),
             hashPrevInputs,
             hashSequence,
-            pack_le_int32(len(tx.outputs)),
+            len(tx.outputs),
             hashOutputHashes,
-            pack_le_uint32(tx.locktime)
-        ))
-        return double_sha256(preimage)
+            tx.locktime
+        )
  
     def get_hash_prev_inputs(self, tx):
-        inputs = b''
-        for txin in tx.inputs:
-            inputs = b''.join((
-                inputs,
-                txin.prev_hash,
-                pack_le_uint32(txin.prev_idx),
-                double_sha256(txin.script)
-            ))
-        h = double_sha256(inputs)
-        return h
+        script_hashes = double_sha256_batch([txin.script for txin in tx.inputs])
+        inputs = b''.join([
+            txin.prev_hash + pack_le_uint32(txin.prev_idx) + script_hash
+            for txin, script_hash in zip(tx.inputs, script_hashes)
+        ])
+        return double_sha256(inputs)
  
     def get_hash_sequence(self, tx):
-        inputs = b''
+        parts = []
         for txin in tx.inputs:
-            inputs = b''.join((
-                inputs,
-                pack_le_uint32(txin.sequence)
-            ))
-        h = double_sha256(inputs)
-        return h
+            parts.append(pack_le_uint32(txin.sequence))
+        return double_sha256(b''.join(parts))
 
     # Generate the hash of the output hashes
     def calculate_pushrefs_count_and_hash(self, pk_script):
-        zeroRef = b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
         all_refs, normal_refs, singleton_refs = Script.get_push_input_refs(pk_script)
+        # Most outputs push no refs
+        if not all_refs:
+            return NO_PUSHREFS
         # Put refs into a dict to sort in order
         ref_dict = {}
         for ref in all_refs:
-            ref_dict[ref] = True 
-        push_input_refs_hash = None
-        if len(ref_dict) > 0:
-            push_input_refs_hash = double_sha256(b''.join(sorted(ref_dict.keys())))
-        else:
-            push_input_refs_hash = zeroRef
-        
-        result = b''.join((pack_le_uint32(len(ref_dict) ), push_input_refs_hash))
-        return result
+            ref_dict[ref] = True
+        push_input_refs_hash = double_sha256(b''.join(sorted(ref_dict.keys())))
+        return pack_le_uint32(len(ref_dict)) + push_input_refs_hash
 
     # Generate the hash of the output hashes
     def get_hash_output_hashes(self, tx):
-        outputs = b''
-        for txout in tx.outputs:
-            outputs = b''.join((
-                outputs,
-                pack_le_uint64(txout.value),
-                double_sha256(txout.pk_script),
-                self.calculate_pushrefs_count_and_hash(txout.pk_script),
-            ))
-        h = double_sha256(outputs)
-        return h
+        script_hashes = double_sha256_batch([txout.pk_script for txout in tx.outputs])
+        calc_pushrefs = self.calculate_pushrefs_count_and_hash
+        outputs = b''.join([
+            pack_le_uint64(txout.value) + script_hash + calc_pushrefs(txout.pk_script)
+            for txout, script_hash in zip(tx.outputs, script_hashes)
+        ])
+        return double_sha256(outputs)
 
     def read_tx_and_vsize(self):
         '''Return a (deserialized TX, vsize) pair.'''
         return self.read_tx(), self.binary_length
 
     def read_tx_block(self):
-        '''Returns a list of (deserialized_tx, tx_hash) pairs.'''
-        read = self.read_tx_and_hash
+        '''Returns a list of (deserialized_tx, tx_hash) pairs.
+
+        Equivalent to calling read_tx_and_hash() for each transaction,
+        but the transactions are all read before any are hashed so
+        that every tx hash can be computed in one batch.
+        '''
+        read_tx = self.read_tx
+        preimage_v3 = self.get_preimage_v3
+        # For hashing each tx in the block without copying it
+        view = memoryview(self.binary)
+        txs = []
+        # The serialized tx, or for version 3 its preimage
+        preimages = []
         # Some coins have excess data beyond the end of the transactions
-        return [read() for _ in range(self._read_varint())]
+        for _ in range(self._read_varint()):
+            start = self.cursor
+            tx = read_tx()
+            txs.append(tx)
+            if tx.version == 3:
+                preimages.append(preimage_v3(tx))
+            else:
+                preimages.append(view[start:self.cursor])
+
+        return list(zip(txs, double_sha256_batch(preimages)))
 
     def _read_inputs(self):
         read_input = self._read_input
         return [read_input() for i in range(self._read_varint())]
 
     def _read_input(self):
-        return TxInput(
-            self._read_nbytes(32),   # prev_hash
-            self._read_le_uint32(),  # prev_idx
-            self._read_varbytes(),   # script
-            self._read_le_uint32()   # sequence
-        )
+        # The integer reads are inlined; this is called for every input
+        binary = self.binary
+        prev_hash = self._read_nbytes(32)
+        prev_idx, = unpack_le_uint32_from(binary, self.cursor)
+        self.cursor += 4
+        script = self._read_varbytes()
+        sequence, = unpack_le_uint32_from(binary, self.cursor)
+        self.cursor += 4
+        return TxInput(prev_hash, prev_idx, script, sequence)
 
     def _read_outputs(self):
-        read_output = self._read_output
-        return [read_output() for i in range(self._read_varint())]
-
-    def _read_output(self):
-        return TxOutput(
-            self._read_le_int64(),  # value
-            self._read_varbytes(),  # pk_script
-        )
+        # Each output is read inline to save a call per output; subclasses
+        # with a different output format must override this method
+        binary = self.binary
+        read_varbytes = self._read_varbytes
+        outputs = []
+        for _ in range(self._read_varint()):
+            value, = unpack_le_int64_from(binary, self.cursor)
+            self.cursor += 8
+            outputs.append(TxOutput(value, read_varbytes()))
+        return outputs
 
     def _read_byte(self):
         cursor = self.cursor
@@ -286,7 +314,19 @@ class Deserializer(object):
         return self.binary[cursor:end]
 
     def _read_varbytes(self):
-        return self._read_nbytes(self._read_varint())
+        # Inlines _read_varint() and _read_nbytes() for lengths below 253,
+        # which covers almost all scripts
+        binary = self.binary
+        cursor = self.cursor
+        n = binary[cursor]
+        if n < 253:
+            cursor += 1
+        else:
+            n = self._read_varint()
+            cursor = self.cursor
+        self.cursor = end = cursor + n
+        assert self.binary_length >= end
+        return binary[cursor:end]
 
     def _read_varint(self):
         n = self.binary[self.cursor]
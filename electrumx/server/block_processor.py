@@ -417,17 +417,13 @@ class BlockProcessor:
         for txin in tx.inputs:
             if txin.is_generation():
                 continue
-            
-            # Debugging information for transaction inputs
-            print(f"Processing input: prev_hash={txin.prev_hash.hex()}, prev_idx={txin.prev_idx}")
 
             try:
                 cache_value = spend_utxo(txin.prev_hash, txin.prev_idx)
                 undo_info_append(cache_value)
                 append_hashX(cache_value[:-13])
-            except ChainError as e:
-                print(f"Error: {str(e)}")
-                print(f"UTXO not found: {txin.prev_hash.hex()} / {txin.prev_idx}")
+            except ChainError:
+                # spend_utxo has already logged the missing UTXO
                 # Optionally, return or raise error to halt processing
                 continue
 
@@ -603,18 +599,18 @@ class BlockProcessor:
 
 
     def spend_utxo(self, tx_hash, tx_idx):
-     logger.debug("Attempting to spend UTXO: {} / {}".format(tx_hash, tx_idx))
+     logger.debug("Attempting to spend UTXO: %s / %s", tx_hash, tx_idx)
 
      idx_packed = pack_le_uint32(tx_idx)
      cache_value = self.utxo_cache.pop(tx_hash + idx_packed, None)
      if cache_value:
-        logger.debug("UTXO found in cache: {}".format(cache_value))
+        logger.debug("UTXO found in cache: %s", cache_value)
         return cache_value
 
      prefix = b'h' + tx_hash[:4] + idx_packed
      candidates = {db_key: hashX for db_key, hashX in self.db.utxo_db.iterator(prefix=prefix)}
 
-     logger.debug("Candidates found in DB: {}".format(candidates))
+     logger.debug("Candidates found in DB: %s", candidates)
 
      for hdb_key, hashX in candidates.items():
         tx_num_packed = hdb_key[-5:]
@@ -630,8 +626,9 @@ class BlockProcessor:
         if utxo_value_packed:
             self.db_deletes.append(hdb_key)
             self.db_deletes.append(udb_key)
-            logger.debug("UTXO spent: {}".format(hashX + tx_num_packed + utxo_value_packed))
-            return hashX + tx_num_packed + utxo_value_packed
+            cache_value = hashX + tx_num_packed + utxo_value_packed
+            logger.debug("UTXO spent: %s", cache_value)
+            return cache_value
 
      logger.error("UTXO not found: {} / {}".format(hash_to_hex_str(tx_hash), tx_idx))
      raise ChainError('UTXO {} / {:,d} not found in "h" table'.format(hash_to_hex_str(tx_hash), tx_idx))
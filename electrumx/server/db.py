@@ -25,7 +25,7 @@ from electrumx.lib.hash import hash_to_hex_str
 from electrumx.lib.merkle import Merkle, MerkleCache
 from electrumx.lib.util import (
     formatted_time, pack_be_uint16, pack_be_uint32, pack_le_uint32,
-    unpack_le_uint32, unpack_be_uint32, unpack_le_uint64
+    unpack_le_uint32_from, unpack_be_uint32_from, unpack_le_uint64
 )
 from electrumx.server.storage import db_class
 from electrumx.server.history import History
@@ -488,7 +488,7 @@ class DB(object):
         min_height = self.min_undo_height(self.db_height)
         keys = []
         for key, _hist in self.utxo_db.iterator(prefix=prefix):
-            height, = unpack_be_uint32(key[-4:])
+            height, = unpack_be_uint32_from(key, -4)
             if height >= min_height:
                 break
             keys.append(key)
@@ -682,7 +682,7 @@ class DB(object):
             # Value: the UTXO value as a 64-bit unsigned integer
             prefix = b'u' + hashX
             for db_key, db_value in self.utxo_db.iterator(prefix=prefix):
-                tx_pos, = unpack_le_uint32(db_key[-9:-5])
+                tx_pos, = unpack_le_uint32_from(db_key, -9)
                 tx_num, = unpack_le_uint64(db_key[-5:] + bytes(3))
                 value, = unpack_le_uint64(db_value)
                 tx_hash, height = self.fs_tx_hash(tx_num)
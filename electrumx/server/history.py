@@ -92,7 +92,7 @@ class History(object):
 
         keys = []
         for key, _hist in self.db.iterator(prefix=b''):
-            flush_id, = unpack_be_uint16_from(key[-2:])
+            flush_id, = unpack_be_uint16_from(key, -2)
             if flush_id > utxo_flush_count:
                 keys.append(key)
 
@@ -17,6 +17,11 @@ setuptools.setup(
         'uvloop': ['uvloop>=0.14'],
     },
     packages=setuptools.find_packages(include=('electrumx*',)),
+    # Optional; electrumx.lib.script falls back to pure Python without it
+    ext_modules=[
+        setuptools.Extension('electrumx.lib._script',
+                             ['electrumx/lib/_script.c'], optional=True),
+    ],
     description='ElectrumX Server',
     author='Neil Booth',
     author_email='kyuupichan@gmail.com',
@@ -16,6 +16,12 @@ def test_sha256():
 def test_double_sha256():
     assert lib_hash.double_sha256(b'double_sha256') == b'ksn\x8e\xb7\xb9\x0f\xf6\xd9\xad\x88\xd9#\xa1\xbcU(j1Bx\xce\xd5;s\xectL\xe7\xc5\xb4\x00'
 
+def test_double_sha256_batch():
+    items = [b'', b'double_sha256', bytearray(b'abc'), memoryview(b'x' * 100)]
+    assert lib_hash.double_sha256_batch(items) == [lib_hash.double_sha256(item)
+                                                   for item in items]
+    assert lib_hash.double_sha256_batch([]) == []
+
 def test_hash_to_hex_str():
     assert lib_hash.hash_to_hex_str(b'hash_to_str') == '7274735f6f745f68736168'
 
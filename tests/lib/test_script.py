@@ -1,6 +1,24 @@
+import os
+
 import pytest
 
-from electrumx.lib.script import OpCodes, is_unspendable_legacy, is_unspendable_genesis
+import electrumx.lib.script as lib_script
+from electrumx.lib.script import (
+    OpCodes, Script, ScriptError, ScriptPubKey, is_unspendable_legacy,
+    is_unspendable_genesis, is_P2PKH, is_P2SH, is_P2PK
+)
+
+
+@pytest.fixture(params=['c', 'python'])
+def scanner(request, monkeypatch):
+    '''Run a test against both the C extension and the pure-Python scanners.'''
+    if request.param == 'c':
+        if lib_script._script is None:
+            if os.environ.get('ELECTRUMX_REQUIRE_C'):
+                pytest.fail('C extension not built')
+            pytest.skip('C extension not built')
+    else:
+        monkeypatch.setattr(lib_script, '_script', None)
 
 
 @pytest.mark.parametrize("script, iug", (
@@ -24,3 +42,86 @@ def test_op_return_legacy(script, iug):
 def test_not_op_return(script):
     assert not is_unspendable_legacy(script)
     assert not is_unspendable_genesis(script)
+
+
+REF = bytes(range(36))
+
+
+@pytest.mark.parametrize("script, ops", (
+    (bytes([OpCodes.OP_0]), [(OpCodes.OP_0, b'')]),
+    (bytes([3, 1, 2, 3, OpCodes.OP_DROP]), [(3, bytes([1, 2, 3])), OpCodes.OP_DROP]),
+    (bytes([OpCodes.OP_PUSHDATA1, 2, 7, 8]), [(OpCodes.OP_PUSHDATA1, bytes([7, 8]))]),
+    (bytes([OpCodes.OP_PUSHDATA2, 1, 0, 9]), [(OpCodes.OP_PUSHDATA2, bytes([9]))]),
+    (bytes([OpCodes.OP_PUSHDATA4, 1, 0, 0, 0, 9]), [(OpCodes.OP_PUSHDATA4, bytes([9]))]),
+    (bytes([OpCodes.OP_PUSHINPUTREF]) + REF + bytes([OpCodes.OP_CHECKSIG]),
+     [(OpCodes.OP_PUSHINPUTREF, REF), OpCodes.OP_CHECKSIG]),
+))
+def test_get_ops(scanner, script, ops):
+    assert Script.get_ops(script) == ops
+
+
+@pytest.mark.parametrize("script", (
+    bytes([2, 1]),
+    bytes([OpCodes.OP_PUSHDATA1]),
+    bytes([OpCodes.OP_PUSHDATA2, 1]),
+    bytes([OpCodes.OP_PUSHDATA4, 1, 0, 0]),
+    bytes([OpCodes.OP_PUSHINPUTREFSINGLETON]) + REF[:35],
+))
+def test_truncated_script(scanner, script):
+    with pytest.raises(ScriptError):
+        Script.get_ops(script)
+    with pytest.raises(ScriptError):
+        Script.get_push_input_refs(script)
+    with pytest.raises(ScriptError):
+        Script.zero_refs(script)
+
+
+def test_push_input_refs(scanner):
+    other = bytes(reversed(REF))
+    script = (bytes([OpCodes.OP_PUSHINPUTREF]) + REF
+              + bytes([OpCodes.OP_REQUIREINPUTREF]) + other
+              + bytes([OpCodes.OP_PUSHINPUTREFSINGLETON]) + other)
+    assert Script.get_push_input_refs(script) == ([REF, other], [REF], [other])
+
+
+def test_zero_refs(scanner):
+    script = bytes([OpCodes.OP_PUSHINPUTREF]) + REF
+    assert Script.zero_refs(script) == script
+    script += bytes([OpCodes.OP_CHECKSIG])
+    assert Script.zero_refs(script) == (bytes([OpCodes.OP_PUSHINPUTREF]) + bytes(36)
+                                        + bytes([OpCodes.OP_CHECKSIG]))
+
+
+def test_zero_refs_pushdata(scanner):
+    # Pushdata length prefixes are not part of the zeroed script
+    script = bytes([OpCodes.OP_PUSHDATA1, 1, 5, OpCodes.OP_CHECKSIG])
+    assert Script.zero_refs(script) == bytes([OpCodes.OP_PUSHDATA1, 5, OpCodes.OP_CHECKSIG])
+
+
+P2PKH = ScriptPubKey.P2PKH_script(bytes(range(20)))
+P2SH = ScriptPubKey.P2SH_script(bytes(range(20)))
+P2PK = Script.push_data(bytes(33)) + bytes([OpCodes.OP_CHECKSIG])
+P2PK_UNCOMPRESSED = Script.push_data(bytes(65)) + bytes([OpCodes.OP_CHECKSIG])
+
+
+@pytest.mark.parametrize("script, kind", (
+    (P2PKH, 'P2PKH'),
+    (P2SH, 'P2SH'),
+    (P2PK, 'P2PK'),
+    (P2PK_UNCOMPRESSED, 'P2PK'),
+    (P2PKH[:-1], None),
+    (P2PKH + bytes([OpCodes.OP_DROP]), None),
+    (bytes([OpCodes.OP_PUSHINPUTREF]) + REF[:22], None),
+    (Script.push_data(bytes(34)) + bytes([OpCodes.OP_CHECKSIG]), None),
+    (b'', None),
+))
+def test_standard_scripts(script, kind):
+    assert is_P2PKH(script) is (kind == 'P2PKH')
+    assert is_P2SH(script) is (kind == 'P2SH')
+    assert is_P2PK(script) is (kind == 'P2PK')
+
+
+@pytest.mark.parametrize("script", (P2PKH, P2SH, P2PK, P2PK_UNCOMPRESSED))
+def test_standard_script_refs(scanner, script):
+    assert Script.zero_refs(script) == script
+    assert Script.get_push_input_refs(script) == ([], [], [])
@@ -1,3 +1,4 @@
+import electrumx.lib.hash as lib_hash
 import electrumx.lib.tx as tx_lib
 
 tests = [
@@ -64,3 +65,32 @@ def test_tx_serialization():
         deser = tx_lib.Deserializer(test)
         tx = deser.read_tx()
         assert tx.serialize() == test
+
+
+def test_pushrefs_count_and_hash():
+    deser = tx_lib.Deserializer(b'')
+    p2pkh = bytes.fromhex('76a9144a519c63f985ba5ab8b71bb42f1ecb82a0a0d80788ac')
+    assert deser.calculate_pushrefs_count_and_hash(p2pkh) == bytes(36)
+
+    ref1, ref2 = bytes([2]) * 36, bytes([1]) * 36
+    # OP_PUSHINPUTREF ref1 OP_PUSHINPUTREFSINGLETON ref2 OP_PUSHINPUTREF ref1
+    script = b'\xd0' + ref1 + b'\xd8' + ref2 + b'\xd0' + ref1 + p2pkh
+    assert deser.calculate_pushrefs_count_and_hash(script) == (
+        bytes([2, 0, 0, 0]) + lib_hash.double_sha256(ref2 + ref1))
+
+
+def test_read_tx_block():
+    p2pkh = bytes.fromhex('76a9144a519c63f985ba5ab8b71bb42f1ecb82a0a0d80788ac')
+    raw_txs = []
+    for n, version in enumerate((1, 3, 2, 3, 1)):
+        tx = tx_lib.Tx(version,
+                       [tx_lib.TxInput(bytes([n]) * 32, n, bytes(n * 100), tx_lib.MINUS_1)],
+                       [tx_lib.TxOutput(n * 1000, p2pkh)],
+                       n)
+        raw_txs.append(tx.serialize())
+    block = bytes([len(raw_txs)]) + b''.join(raw_txs)
+
+    expected = [tx_lib.Deserializer(raw_tx).read_tx_and_hash() for raw_tx in raw_txs]
+    assert tx_lib.Deserializer(block).read_tx_block() == expected
+    assert expected[0][1] == lib_hash.double_sha256(raw_txs[0])
+    assert expected[1][1] != lib_hash.double_sha256(raw_txs[1])